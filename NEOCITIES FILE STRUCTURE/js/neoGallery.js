@@ -1,23 +1,122 @@
+// How many entries are added to a gallery per batch while scrolling
+var BATCH_SIZE = 30;
+
 function getRandomImages(imageArray, count) {
+    // Partial Fisher-Yates shuffle. Swapped slots are tracked in a Map so
+    // the source array is never copied or mutated, keeping this O(count).
     let result = [];
-    let taken = [];
+    let swapped = new Map();
     let len = imageArray.length;
-  
+
     if (count > len) count = len;
-  
-    while (result.length < count) {
-      let randomIndex = Math.floor(Math.random() * len);
-      if (!taken.includes(randomIndex)) {
-        taken.push(randomIndex);
-        result.push(imageArray[randomIndex]);
-      }
+
+    for (let i = 0; i < count; i++) {
+      let randomIndex = i + Math.floor(Math.random() * (len - i));
+      let picked = swapped.has(randomIndex) ? swapped.get(randomIndex) : randomIndex;
+      swapped.set(randomIndex, swapped.has(i) ? swapped.get(i) : i);
+      result.push(imageArray[picked]);
     }
     return result;
   }
-  
+
+  // Swaps in the real thumbnail once an image scrolls near the viewport.
+  // Browsers without IntersectionObserver fall back to native loading="lazy".
+  var lazyObserver = ('IntersectionObserver' in window) ? new IntersectionObserver(function(entries, observer) {
+    entries.forEach(function(entry) {
+      if (entry.isIntersecting) {
+        loadThumbnail(entry.target);
+        observer.unobserve(entry.target);
+      }
+    });
+  }, { rootMargin: '200px 0px' }) : null;
+
+  function loadThumbnail(img) {
+    var thumb = new Image();
+    thumb.onload = function() {
+      img.src = this.src;
+      img.classList.remove('placeholder');
+    };
+    thumb.src = img.dataset.src;
+  }
+
+  // media.json is fetched once and shared by every gallery on the page
+  var mediaPromise = null;
+
+  function fetchMedia() {
+    if (!mediaPromise) {
+      mediaPromise = fetch("json/media.json")
+        .then(response => response.json())
+        .catch(error => {
+          mediaPromise = null;
+          throw error;
+        });
+    }
+    return mediaPromise;
+  }
+
+  function createImageContainer(imgData, index) {
+    var container = document.createElement('div');
+    container.className = 'imageContainer';
+    container.dataset.index = index;
+
+    var img = document.createElement('img');
+    img.alt = imgData.title || '';
+    // Width/height let the browser reserve the right amount of space before the thumbnail arrives
+    if (imgData.width && imgData.height) {
+      img.width = imgData.width;
+      img.height = imgData.height;
+    }
+    if (lazyObserver) {
+      img.dataset.src = imgData.thumbnailSrc;
+      if (imgData.placeholder) {
+        img.src = imgData.placeholder;
+        img.className = 'placeholder';
+      }
+      lazyObserver.observe(img);
+    } else {
+      img.loading = 'lazy';
+      img.src = imgData.thumbnailSrc;
+    }
+
+    var title = document.createElement('p');
+    title.textContent = imgData.title;
+
+    container.appendChild(img);
+    container.appendChild(title);
+    return container;
+  }
+
+  // Appends the next batch of entries to a gallery. Nodes are built in a
+  // fragment so each batch costs a single reflow.
+  function renderBatch(galleryElement) {
+    var state = galleryElement.neoGallery;
+    var end = Math.min(state.rendered + BATCH_SIZE, state.images.length);
+    var fragment = document.createDocumentFragment();
+
+    for (var i = state.rendered; i < end; i++) {
+      fragment.appendChild(createImageContainer(state.images[i], i));
+    }
+    state.rendered = end;
+    galleryElement.insertBefore(fragment, state.sentinel);
+
+    if (state.rendered >= state.images.length) {
+      if (state.observer) state.observer.disconnect();
+      state.sentinel.remove();
+    } else if (state.observer) {
+      // Re-observing forces a fresh callback, so batches keep coming while
+      // the sentinel is still on screen after this one
+      state.observer.unobserve(state.sentinel);
+      state.observer.observe(state.sentinel);
+    } else {
+      // No IntersectionObserver: keep adding batches without blocking the main thread
+      setTimeout(function() {
+        if (galleryElement.neoGallery === state) renderBatch(galleryElement);
+      }, 0);
+    }
+  }
+
   function createImages(galleryElement, tags) {
-    fetch("json/media.json")
-      .then(response => response.json())
+    fetchMedia()
       .then(originalImageArray => {
         // Convert the tags string into an array of tags
         var tagArray = tags.split(',');
@@ -30,93 +129,125 @@ function getRandomImages(imageArray, count) {
           imageArray = getRandomImages(imageArray, 6);
         }
 
-        // Clear the specific gallery and hide its loader
+        // Drop any previous render of this gallery (e.g. on reshuffle)
+        var previous = galleryElement.neoGallery;
+        if (previous && previous.observer) previous.observer.disconnect();
+
+        // Clear the specific gallery, which also removes its loader
         galleryElement.innerHTML = '';
-        const loader = galleryElement.querySelector('.gallery-loader');
-        if (loader) loader.style.display = 'none';
-
-        for (var i = 0; i < imageArray.length; i++) {
-          var imgData = imageArray[i];
-
-          var container = document.createElement('div');
-          container.className = 'imageContainer';
-
-          var img = document.createElement('img');
-          img.src = imgData.thumbnailSrc;
-
-          // Closure to preserve imgData context
-          (function(imgData) {
-            img.onclick = function() {
-              var modal = document.getElementById("myModal");
-              var modalImg = document.getElementById("img01");
-              var titleText = document.getElementById("title");
-              var captionText = document.getElementById("caption");
-              var loadingPlaceholder = document.getElementById("loadingPlaceholder");
-
-              modal.style.display = "block";
-              loadingPlaceholder.style.display = "block";
-              modalImg.style.display = "none";
-              document.body.style.overflow = "hidden";
-              modalImg.src = imgData.fullSrc;
-              titleText.innerHTML = imgData.title;
-              captionText.innerHTML = imgData.description;
-
-              // Load the image
-              var newImage = new Image();
-              newImage.src = imgData.fullSrc;
-
-              newImage.onload = function() {
-                  loadingPlaceholder.style.display = "none";
-                  modalImg.src = this.src;
-                  modalImg.style.display = "block";
-              };
-
-              newImage.onerror = function() {
-                  loadingPlaceholder.style.display = "none";
-                  console.error('Failed to load image:', this.src);
-              };
-            };
-          })(imgData);
-
-          var title = document.createElement('p');
-          title.textContent = imgData.title;
-
-          container.appendChild(img);
-          container.appendChild(title);
-          galleryElement.appendChild(container);
-        }
 
-        // Modal close handlers (only needs to be set up once)
-        if (!window.modalHandlersInitialized) {
-          var modal = document.getElementById("myModal");
-          var span = document.getElementsByClassName("close")[0];
-
-          span.onclick = function() { 
-            modal.style.display = "none";
-            document.body.style.overflow = "auto";
-          }
-
-          window.onclick = function(event) {
-            if (event.target == modal) {
-              modal.style.display = "none";
-              document.body.style.overflow = "auto";
-            }
-          }
-          window.modalHandlersInitialized = true;
+        // The sentinel sits after the last rendered entry; when it nears the
+        // viewport the next batch is appended (infinite scroll).
+        var sentinel = document.createElement('div');
+        sentinel.className = 'gallerySentinel';
+        galleryElement.appendChild(sentinel);
+
+        var state = {
+          images: imageArray,
+          rendered: 0,
+          sentinel: sentinel,
+          observer: null
+        };
+        galleryElement.neoGallery = state;
+
+        if ('IntersectionObserver' in window) {
+          state.observer = new IntersectionObserver(function(entries) {
+            if (entries.some(entry => entry.isIntersecting)) renderBatch(galleryElement);
+          }, { rootMargin: '600px 0px' });
         }
+        renderBatch(galleryElement);
+
+        initModalHandlers();
       })
       .catch(error => console.error('Error fetching images:', error));
   }
-  
+
+  function openModal(imgData) {
+    var modal = document.getElementById("myModal");
+    var modalImg = document.getElementById("img01");
+    var titleText = document.getElementById("title");
+    var captionText = document.getElementById("caption");
+    var loadingPlaceholder = document.getElementById("loadingPlaceholder");
+
+    modal.style.display = "block";
+    document.body.style.overflow = "hidden";
+    // Show the blurred placeholder in place of the hourglass when the entry has one
+    if (imgData.placeholder) {
+      loadingPlaceholder.style.display = "none";
+      modalImg.src = imgData.placeholder;
+      modalImg.classList.add('placeholder');
+      modalImg.style.display = "block";
+    } else {
+      loadingPlaceholder.style.display = "block";
+      modalImg.style.display = "none";
+    }
+    titleText.innerHTML = imgData.title;
+    captionText.innerHTML = imgData.description;
+
+    // Load the image
+    var newImage = new Image();
+    modal.pendingSrc = imgData.fullSrc;
+
+    newImage.onload = function() {
+        // Ignore images that finish after another entry was opened
+        if (modal.pendingSrc !== imgData.fullSrc) return;
+        loadingPlaceholder.style.display = "none";
+        modalImg.src = this.src;
+        modalImg.classList.remove('placeholder');
+        modalImg.style.display = "block";
+    };
+
+    newImage.onerror = function() {
+        console.error('Failed to load image:', this.src);
+        if (modal.pendingSrc !== imgData.fullSrc) return;
+        // Drop the hourglass/blurred placeholder so it is not mistaken for a load in progress
+        loadingPlaceholder.style.display = "none";
+        modalImg.classList.remove('placeholder');
+        modalImg.style.display = "none";
+        captionText.textContent = 'This image could not be loaded.';
+    };
+    newImage.src = imgData.fullSrc;
+  }
+
+  function closeModal() {
+    var modal = document.getElementById("myModal");
+    modal.style.display = "none";
+    modal.pendingSrc = null;
+    document.body.style.overflow = "auto";
+  }
+
+  // One delegated click handler serves every gallery entry and the modal
+  // (only needs to be set up once)
+  function initModalHandlers() {
+    if (window.modalHandlersInitialized) return;
+
+    document.addEventListener('click', function(event) {
+      var modal = document.getElementById("myModal");
+      if (event.target == modal || event.target.closest('#myModal .close')) {
+        closeModal();
+        return;
+      }
+
+      var container = event.target.closest('.gallery .imageContainer');
+      if (!container) return;
+      var state = container.parentElement.neoGallery;
+      if (state) openModal(state.images[container.dataset.index]);
+    });
+    window.modalHandlersInitialized = true;
+  }
+
   window.onload = function() {
     document.querySelectorAll('.gallery').forEach(gallery => {
         const tags = gallery.dataset.tag;
         createImages(gallery, tags);
     });
 };
-  
+
   // Reshuffle only the 'random' gallery
-  document.getElementById('reshuffle').onclick = function() {
-    const allGallery = document.querySelector('.gallery[data-tag="random"]');
-    createImages(allGallery, 'random');
-  };
\ No newline at end of file
+  var reshuffle = document.getElementById('reshuffle');
+  if (reshuffle) {
+    reshuffle.onclick = function() {
+      const allGallery = document.querySelector('.gallery[data-tag="random"]');
+      createImages(allGallery, 'random');
+    };
+  }
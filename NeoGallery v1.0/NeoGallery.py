@@ -1,18 +1,43 @@
 #!/usr/bin/env python
 import os
 import sys
+import io
 import json
+import marshal
 import re
+import shutil
+import base64
+import gc
+import posixpath
+import threading
+import time
+import tracemalloc
 import neocities
 import requests
 import webbrowser
+from array import array
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
-from flask import Flask, request, jsonify, abort
+from typing import Annotated, Optional
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Blueprint, request, jsonify, abort, g, has_app_context, send_from_directory
 from PIL import Image, ImageSequence
+from werkzeug.local import LocalProxy
 from werkzeug.utils import secure_filename
-from dotenv import load_dotenv
+from dotenv import load_dotenv, dotenv_values
 from waitress import serve
 
+# Optional faster JSON libraries. The stdlib json module is used when neither is installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 # ------------------------------------------------------------------------------
 # 1. SET THE BASE DIRECTORY ACCORDING TO THE RUNNING CONTEXT
 #
@@ -32,51 +57,66 @@ load_dotenv(dotenv_path=BASE_DIR / ".env")
 # ----------------------- CONFIGURATION -----------------------
 class Config:
     
-    def __init__(self):
+    def __init__(self, env=None, base_dir=None):
+        # Settings come from os.environ unless a site profile passes its own.
+        env = os.environ if env is None else env
+
         # Use the appropriate base directory depending on frozen status.
-        self.BASE_DIR = BASE_DIR
+        self.BASE_DIR = base_dir or BASE_DIR
 
         # Folders and file paths – note that these paths are relative to BASE_DIR.
-        self.STATIC_URL_PATH = os.environ.get("STATIC_URL_PATH", "/assets")
-        self.STATIC_FOLDER = self.BASE_DIR / os.environ.get("STATIC_FOLDER", "static/assets")
-        self.JSON_DIR = self.STATIC_FOLDER / os.environ.get("JSON_SUBDIR", "json")
+        self.STATIC_URL_PATH = env.get("STATIC_URL_PATH", "/assets")
+        self.STATIC_FOLDER = self.BASE_DIR / env.get("STATIC_FOLDER", "static/assets")
+        self.JSON_DIR = self.STATIC_FOLDER / env.get("JSON_SUBDIR", "json")
         
-        self.ALL_ART_JSON = self.JSON_DIR / os.environ.get("ALL_ART_JSON", "allArt.json")
-        self.TAG_LIST_JSON = self.JSON_DIR / os.environ.get("TAG_LIST_JSON", "tag_list.json")
+        self.ALL_ART_JSON = self.JSON_DIR / env.get("ALL_ART_JSON", "allArt.json")
+        self.TAG_LIST_JSON = self.JSON_DIR / env.get("TAG_LIST_JSON", "tag_list.json")
 
-        self.TEMPLATE_DIR = self.BASE_DIR / os.environ.get("TEMPLATE_DIR", "templates")
-        self.ART_HTML = self.TEMPLATE_DIR / os.environ.get("ART_HTML", "art.html")
-        self.TAG_TEMPLATE = self.TEMPLATE_DIR / os.environ.get("TAG_TEMPLATE", "tagTemplate.html")
-        self.INDEX_HTML = self.TEMPLATE_DIR / os.environ.get("INDEX_HTML", "index.html")
+        self.TEMPLATE_DIR = self.BASE_DIR / env.get("TEMPLATE_DIR", "templates")
+        self.ART_HTML = self.TEMPLATE_DIR / env.get("ART_HTML", "art.html")
+        self.TAG_TEMPLATE = self.TEMPLATE_DIR / env.get("TAG_TEMPLATE", "tagTemplate.html")
+        self.INDEX_HTML = self.TEMPLATE_DIR / env.get("INDEX_HTML", "index.html")
 
         # Asset directories (local)
-        self.ART_DIR = self.STATIC_FOLDER / os.environ.get("ART_SUBDIR", "art")
-        self.THUMB_DIR = self.STATIC_FOLDER / os.environ.get("THUMB_SUBDIR", "thumbnails")
+        self.ART_DIR = self.STATIC_FOLDER / env.get("ART_SUBDIR", "art")
+        self.THUMB_DIR = self.STATIC_FOLDER / env.get("THUMB_SUBDIR", "thumbnails")
         self.TAG_COVERS_DIR = self.STATIC_FOLDER / "tag_covers"
-        self.NEOCITIES_TAG_COVERS_DIR = os.environ.get("NEOCITIES_TAG_COVERS_DIR", "assets/tag_covers")
+        self.NEOCITIES_TAG_COVERS_DIR = env.get("NEOCITIES_TAG_COVERS_DIR", "assets/tag_covers")
         # Remote directories for Neocities uploads
-        self.NEOCITIES_ART_DIR = os.environ.get("NEOCITIES_ART_DIR", "assets/media")
-        self.NEOCITIES_THUMB_DIR = os.environ.get("NEOCITIES_THUMB_DIR", "assets/thumbnails")
-        self.NEOCITIES_JSON_DIR = os.environ.get("NEOCITIES_JSON_DIR", "assets/json")
-        self.NEOCITIES_GALLERY_DIR = os.environ.get("NEOCITIES_GALLERY_DIR", "")
-        self.NEOCITIES_TAG_DIR = os.environ.get("NEOCITIES_TAG_DIR", "")
+        self.NEOCITIES_ART_DIR = env.get("NEOCITIES_ART_DIR", "assets/media")
+        self.NEOCITIES_THUMB_DIR = env.get("NEOCITIES_THUMB_DIR", "assets/thumbnails")
+        self.NEOCITIES_JSON_DIR = env.get("NEOCITIES_JSON_DIR", "assets/json")
+        self.NEOCITIES_GALLERY_DIR = env.get("NEOCITIES_GALLERY_DIR", "")
+        self.NEOCITIES_TAG_DIR = env.get("NEOCITIES_TAG_DIR", "")
 
         # Neocities credentials
-        self.API_KEY = os.environ.get('NEOCITIES_API_KEY')
-        self.USER = os.environ.get('NEOCITIES_USER')
-        self.PASS = os.environ.get('NEOCITIES_PASS')
+        self.API_KEY = env.get('NEOCITIES_API_KEY')
+        self.USER = env.get('NEOCITIES_USER')
+        self.PASS = env.get('NEOCITIES_PASS')
 
         # Server configuration
-        self.HOST = os.environ.get("FLASK_HOST", "127.0.0.1")
-        self.PORT = int(os.environ.get("FLASK_PORT", "5000"))
-        self.DEBUG = os.environ.get("FLASK_DEBUG", "True").lower() in ["true", "1", "yes"]
+        self.HOST = env.get("FLASK_HOST", "127.0.0.1")
+        self.PORT = int(env.get("FLASK_PORT", "5000"))
+        self.DEBUG = env.get("FLASK_DEBUG", "True").lower() in ["true", "1", "yes"]
         
         # Pagination/Thumbnail settings
-        self.DEFAULT_PER_PAGE = int(os.environ.get("DEFAULT_PER_PAGE", "10"))
-        self.THUMBNAIL_WIDTH = int(os.environ.get("THUMBNAIL_WIDTH", "150"))
+        self.DEFAULT_PER_PAGE = int(env.get("DEFAULT_PER_PAGE", "10"))
+        self.THUMBNAIL_WIDTH = int(env.get("THUMBNAIL_WIDTH", "150"))
+
+        # JSON library used for the catalog files: auto, orjson, msgspec or json
+        self.JSON_CODEC = env.get("JSON_CODEC", "auto").lower()
+
+        # Multi-site mode: comma-separated profile names, each with its own
+        # folder (and .env) under SITES_DIR. Empty means a single site.
+        self.SITES = [name.strip() for name in env.get("SITES", "").split(",") if name.strip()]
+        self.SITES_DIR = self.BASE_DIR / env.get("SITES_DIR", "sites")
+
+        # Worker pools shared by every site
+        self.THUMBNAIL_WORKERS = int(env.get("THUMBNAIL_WORKERS", "2"))
+        self.UPLOAD_WORKERS = int(env.get("UPLOAD_WORKERS", "4"))
 
         # "random" tag name
-        self.SHOW_IN_RANDOM = os.environ.get("SHOW_IN_RANDOM", "all")
+        self.SHOW_IN_RANDOM = env.get("SHOW_IN_RANDOM", "all")
 
         # Default tag snippet
         default_tag_snippet = """
@@ -84,11 +124,11 @@ class Config:
 <a href="/__DATA_TAG__.html"><p class="headers">__LINK_TITLE__</p></a>
 </td></tr>
 """  
-        self.TAG_SECTION_TEMPLATE = os.environ.get("TAG_SECTION_TEMPLATE", default_tag_snippet)
+        self.TAG_SECTION_TEMPLATE = env.get("TAG_SECTION_TEMPLATE", default_tag_snippet)
 
         # ------------------ ENSURE DIRECTORY STRUCTURE ------------------
         # Make sure these directories exist. (They are assumed writable.)
-        self.TEMPLATE_DIR.mkdir(exist_ok=True)
+        self.TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
         self.ART_DIR.mkdir(parents=True, exist_ok=True)
         self.THUMB_DIR.mkdir(parents=True, exist_ok=True)
         self.JSON_DIR.mkdir(parents=True, exist_ok=True)
@@ -121,63 +161,703 @@ class Config:
         return self.NEOCITIES_GALLERY_DIR.strip() if self.NEOCITIES_GALLERY_DIR else ""
 
 # ----------------------- UTILITIES -----------------------
+class JsonCodec:
+    """Encodes/decodes JSON with the stdlib json module."""
+    name = "json"
+
+    @property
+    def decode_errors(self):
+        return (json.JSONDecodeError, UnicodeDecodeError)
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj):
+        if isinstance(obj, list) and obj:
+            # indent= makes json fall back to its pure-Python encoder; one
+            # compact object per line keeps the C encoder and a readable file.
+            return ("[\n" + ",\n".join(map(json.dumps, obj)) + "\n]").encode('utf-8')
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+    def decode_art_records(self, data):
+        """
+        Decodes ALL_ART_JSON straight into validated ArtRecord structs. Entries
+        the typed decoder rejects come back as plain dicts to be checked by
+        ArtEntry.validate. Returns None when the codec has no typed decoding.
+        """
+        return None
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    @property
+    def decode_errors(self):
+        return (orjson.JSONDecodeError,)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    @property
+    def decode_errors(self):
+        return (msgspec.DecodeError,)
+
+    def loads(self, data):
+        return msgspec.json.decode(data)
+
+    def decode_art_records(self, data):
+        try:
+            return ART_RECORDS_DECODER.decode(data)
+        except msgspec.ValidationError:
+            pass
+        # Some entries have unknown keys or bad values. The list is split into
+        # raw entries without building them, and only those the typed decoder
+        # rejects are decoded as plain objects for ArtEntry.validate.
+        try:
+            raw_entries = RAW_LIST_DECODER.decode(data)
+        except msgspec.ValidationError:
+            return None
+        records = []
+        for raw in raw_entries:
+            try:
+                records.append(ART_RECORD_DECODER.decode(raw))
+            except msgspec.ValidationError:
+                records.append(msgspec.json.decode(raw))
+        return records
+
+    def dumps(self, obj):
+        return msgspec.json.format(msgspec.json.encode(obj), indent=2)
+
+# Tried in this order by get_codec("auto"); msgspec comes first because it
+# validates the catalog while decoding.
+JSON_CODECS = {
+    "msgspec": (MsgspecCodec, lambda: msgspec is not None),
+    "orjson": (OrjsonCodec, lambda: orjson is not None),
+    "json": (JsonCodec, lambda: True),
+}
+
+def get_codec(name="auto"):
+    """
+    Returns the codec called `name`, or the fastest installed one for "auto".
+    Falls back to the stdlib codec when the requested library is missing.
+    """
+    if name == "auto":
+        return next(codec() for codec, available in JSON_CODECS.values() if available())
+    if name not in JSON_CODECS:
+        print(f"[ERROR] Unknown JSON_CODEC '{name}', using json")
+        return JsonCodec()
+    codec, available = JSON_CODECS[name]
+    if not available():
+        print(f"[ERROR] JSON_CODEC '{name}' is not installed, using json")
+        return JsonCodec()
+    return codec()
+
+class CatalogError(ValueError):
+    """Raised when a JSON file contains entries that fail validation."""
+    def __init__(self, source, problems):
+        self.source = source
+        self.problems = problems
+        shown = "; ".join(problems[:5])
+        if len(problems) > 5:
+            shown += f" (and {len(problems) - 5} more)"
+        super().__init__(f"Malformed entries in {source}: {shown}")
+
+def decode_records(items, decode, source):
+    """
+    Runs `decode` on every item of a JSON list. Problems are collected with
+    the position of the offending entry and raised together as a CatalogError.
+    """
+    records = []
+    problems = []
+    for i, item in enumerate(items):
+        try:
+            records.append(decode(item))
+        except ValueError as e:
+            problems.append(f"[{i}] {e}")
+    if problems:
+        raise CatalogError(source, problems)
+    return records
+
 class FileUtils:
+    codec = get_codec()
+
     @staticmethod
     def safe_json_load(path):
         try:
-            if path.exists():
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data if isinstance(data, list) else []
-            return []
-        except json.JSONDecodeError:
-            abort(500, f"Corrupted JSON file: {path.name}")
+            if not path.exists():
+                return []
+            data = FileUtils.codec.loads(path.read_bytes())
+        except FileUtils.codec.decode_errors as e:
+            abort(500, f"Corrupted JSON file: {path.name}: {str(e)}")
+        if not isinstance(data, list):
+            abort(500, f"Corrupted JSON file: {path.name}: expected a list, got {type(data).__name__}")
+        return data
 
     @staticmethod
     def safe_json_save(data, path):
         try:
             temp_path = path.with_suffix('.png')
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            temp_path.write_bytes(FileUtils.codec.dumps(data))
             temp_path.replace(path)
         except IOError as e:
             abort(500, f"Failed to save {path.name}: {str(e)}")
 
+# ----------------------- CATALOG -----------------------
+class Interner:
+    """
+    Maps strings to small integer IDs and back, so a tag or path prefix is
+    stored once no matter how many entries use it. Path prefixes are shared
+    process-wide; each catalog keeps its own tag table.
+    """
+    def __init__(self, limit=None):
+        self.values = []
+        self.ids = {}
+        self.limit = limit
+        self._lock = threading.Lock()
+
+    def intern(self, value):
+        value_id = self.ids.get(value)
+        if value_id is not None:
+            return value_id
+        with self._lock:
+            if value not in self.ids:
+                if self.limit is not None and len(self.values) >= self.limit:
+                    raise ValueError(f"more than {self.limit} distinct values, cannot add {value!r}")
+                self.values.append(value)
+                self.ids[value] = len(self.values) - 1
+            return self.ids[value]
+
+    def lookup(self, value_id):
+        return self.values[value_id]
+
+    def rename(self, value_id, value):
+        """Gives an existing ID a new, not yet interned, value."""
+        with self._lock:
+            del self.ids[self.values[value_id]]
+            self.values[value_id] = value
+            self.ids[value] = value_id
+
+# Tag IDs are stored as unsigned shorts, which allows up to 65536 distinct
+# tags per catalog.
+TAG_ID_TYPECODE = 'H'
+TAG_ID_LIMIT = 2 ** (8 * array(TAG_ID_TYPECODE).itemsize)
+PATH_PREFIXES = Interner()
+
+def new_tag_table():
+    return Interner(limit=TAG_ID_LIMIT)
+
+class ArtEntry:
+    """
+    Compact record for one media entry. Tags are kept as an array of interned
+    IDs and each src is split into an interned directory prefix plus the file
+    name, both rebuilt by to_dict() when the catalog is written back out.
+    The thumbnail name is not stored at all when it is the usual
+    "thumbnail_<full name>".
+    """
+    __slots__ = ('thumb_prefix', '_thumb_name', 'full_prefix', 'full_name',
+                 'title', 'description', 'tag_ids', 'width', 'height',
+                 'placeholder', 'extra', 'tag_table')
+
+    FIELDS = frozenset(('thumbnailSrc', 'fullSrc', 'title', 'description', 'tags',
+                        'width', 'height', 'placeholder'))
+
+    def __init__(self, thumbnail_src, full_src, title="", description="", tags=(),
+                 width=None, height=None, placeholder=None, extra=None, tag_table=None):
+        self._set_paths(thumbnail_src, full_src)
+        # Catalog.add moves the entry onto the catalog's own table.
+        self.tag_table = new_tag_table() if tag_table is None else tag_table
+        self.title = title
+        self.description = description
+        self.tags = tags
+        self.width = width
+        self.height = height
+        self.placeholder = placeholder
+        # Unknown keys are kept as-is so nothing is lost on a round trip.
+        self.extra = extra or None
+
+    def _set_paths(self, thumbnail_src, full_src):
+        head, sep, full_name = full_src.rpartition('/')
+        self.full_prefix = PATH_PREFIXES.intern(head + sep)
+        self.full_name = full_name
+        head, sep, thumb_name = thumbnail_src.rpartition('/')
+        self.thumb_prefix = PATH_PREFIXES.intern(head + sep)
+        self._thumb_name = None if thumb_name == "thumbnail_" + full_name else thumb_name
+
+    @property
+    def thumb_name(self):
+        if self._thumb_name is None:
+            return "thumbnail_" + self.full_name
+        return self._thumb_name
+
+    @property
+    def thumbnail_src(self):
+        return PATH_PREFIXES.lookup(self.thumb_prefix) + self.thumb_name
+
+    @thumbnail_src.setter
+    def thumbnail_src(self, value):
+        self._set_paths(value, self.full_src)
+
+    @property
+    def full_src(self):
+        return PATH_PREFIXES.lookup(self.full_prefix) + self.full_name
+
+    @full_src.setter
+    def full_src(self, value):
+        self._set_paths(self.thumbnail_src, value)
+
+    @property
+    def tags(self):
+        names = self.tag_table.values
+        return [names[tag_id] for tag_id in self.tag_ids]
+
+    @tags.setter
+    def tags(self, value):
+        table = self.tag_table
+        tag_ids = [table.ids.get(tag) for tag in value]
+        if None in tag_ids:
+            tag_ids = [table.intern(tag) for tag in value]
+        self.tag_ids = array(TAG_ID_TYPECODE, tag_ids)
+
+    def has_tag(self, tag):
+        tag_id = self.tag_table.ids.get(tag)
+        return tag_id is not None and tag_id in self.tag_ids
+
+    def set_metadata(self, metadata):
+        self.width = metadata["width"]
+        self.height = metadata["height"]
+        self.placeholder = metadata["placeholder"]
+
+    @classmethod
+    def from_dict(cls, data, tag_table=None):
+        """Builds an entry from its JSON form, raising ValueError if it is malformed."""
+        return cls.from_records([cls.validate(data)], tag_table or new_tag_table())[0]
+
+    @classmethod
+    def validate(cls, data):
+        """Checks one entry in its JSON form and returns it, raising ValueError if it is malformed."""
+        if not isinstance(data, dict):
+            raise ValueError(f"expected an object, got {type(data).__name__}")
+        for key in ('thumbnailSrc', 'fullSrc'):
+            if not isinstance(data.get(key), str) or not data[key]:
+                raise ValueError(f"'{key}' must be a non-empty string")
+        title = data.get('title', "")
+        description = data.get('description', "")
+        if not isinstance(title, str) or not isinstance(description, str):
+            raise ValueError("'title' and 'description' must be strings")
+        tags = data.get('tags') or ()
+        if not isinstance(tags, (list, tuple)) or not all(type(t) is str for t in tags):
+            raise ValueError("'tags' must be a list of strings")
+        width = data.get('width')
+        height = data.get('height')
+        for value in (width, height):
+            if value is not None and (type(value) is not int or value <= 0):
+                raise ValueError("'width' and 'height' must be positive integers")
+        placeholder = data.get('placeholder')
+        if placeholder is not None and not isinstance(placeholder, str):
+            raise ValueError("'placeholder' must be a string")
+        return data
+
+    @classmethod
+    def from_records(cls, records, tag_table):
+        """
+        Builds entries from records that were already validated: ArtRecord
+        structs, or entries in their JSON form. Same result as calling the
+        constructor for each, with the per-entry lookups hoisted out of the loop.
+        """
+        new = cls.__new__
+        fields = cls.FIELDS
+        prefix_ids = PATH_PREFIXES.ids
+        tag_ids = tag_table.ids
+        # Entries with the same tags share one array; tag_ids is never
+        # modified in place, only replaced.
+        tag_arrays = {}
+        entries = []
+        append = entries.append
+        for record in records:
+            if type(record) is dict:
+                get = record.get
+                full_src = record['fullSrc']
+                thumbnail_src = record['thumbnailSrc']
+                title = get('title', "")
+                description = get('description', "")
+                tags = get('tags') or ()
+                width = get('width')
+                height = get('height')
+                placeholder = get('placeholder')
+                # Unknown keys are kept as-is so nothing is lost on a round trip.
+                extra = None if record.keys() <= fields else {k: v for k, v in record.items() if k not in fields}
+            else:
+                full_src = record.full_src
+                thumbnail_src = record.thumbnail_src
+                title = record.title
+                description = record.description
+                tags = record.tags
+                width = record.width
+                height = record.height
+                placeholder = record.placeholder
+                extra = None
+            entry = new(cls)
+            head, sep, full_name = full_src.rpartition('/')
+            prefix_id = prefix_ids.get(head + sep)
+            entry.full_prefix = PATH_PREFIXES.intern(head + sep) if prefix_id is None else prefix_id
+            entry.full_name = full_name
+            head, sep, thumb_name = thumbnail_src.rpartition('/')
+            prefix_id = prefix_ids.get(head + sep)
+            entry.thumb_prefix = PATH_PREFIXES.intern(head + sep) if prefix_id is None else prefix_id
+            entry._thumb_name = None if thumb_name == "thumbnail_" + full_name else thumb_name
+            entry.title = title
+            entry.description = description
+            key = tuple(tags)
+            ids = tag_arrays.get(key)
+            if ids is None:
+                ids = [tag_ids.get(tag) for tag in key]
+                if None in ids:
+                    ids = [tag_table.intern(tag) for tag in key]
+                ids = tag_arrays[key] = array(TAG_ID_TYPECODE, ids)
+            entry.tag_ids = ids
+            entry.width = width
+            entry.height = height
+            entry.placeholder = placeholder
+            entry.extra = extra or None
+            entry.tag_table = tag_table
+            append(entry)
+        return entries
+
+    def to_dict(self):
+        prefixes = PATH_PREFIXES.values
+        names = self.tag_table.values
+        data = {
+            "thumbnailSrc": prefixes[self.thumb_prefix] + self.thumb_name,
+            "fullSrc": prefixes[self.full_prefix] + self.full_name,
+            "title": self.title,
+            "description": self.description,
+            "tags": [names[tag_id] for tag_id in self.tag_ids],
+        }
+        if self.width is not None:
+            data["width"] = self.width
+        if self.height is not None:
+            data["height"] = self.height
+        if self.placeholder is not None:
+            data["placeholder"] = self.placeholder
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+class Catalog:
+    """
+    The list of ArtEntry records behind ALL_ART_JSON. Tag IDs come from the
+    catalog's own table, so one site's tags never use up another's.
+    """
+    def __init__(self, entries=None, tag_table=None):
+        self.entries = entries or []
+        self.tag_table = new_tag_table() if tag_table is None else tag_table
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @classmethod
+    def from_list(cls, data, source="catalog"):
+        return cls.from_records(decode_records(data, ArtEntry.validate, source))
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a catalog from records that were already validated."""
+        tag_table = new_tag_table()
+        return cls(ArtEntry.from_records(records, tag_table), tag_table)
+
+    def to_list(self):
+        return [entry.to_dict() for entry in self.entries]
+
+    def add(self, entry):
+        if entry.tag_table is not self.tag_table:
+            tags = entry.tags
+            self.intern_tags(tags)
+            entry.tag_table = self.tag_table
+            entry.tags = tags
+        self.entries.append(entry)
+
+    def intern_tags(self, tags):
+        """
+        Makes sure every tag has an ID in this catalog's table, compacting the
+        table first when it is full. Raises ValueError if they still don't fit.
+        """
+        try:
+            return [self.tag_table.intern(tag) for tag in tags]
+        except ValueError:
+            self.compact_tags()
+            return [self.tag_table.intern(tag) for tag in tags]
+
+    def compact_tags(self):
+        """Rebuilds the tag table with only the tags entries still use."""
+        old_names = self.tag_table.values
+        table = new_tag_table()
+        for entry in self.entries:
+            entry.tag_ids = array(TAG_ID_TYPECODE, [table.intern(old_names[i]) for i in entry.tag_ids])
+            entry.tag_table = table
+        self.tag_table = table
+
+    def remove(self, entry):
+        self.entries.remove(entry)
+
+    def find(self, full_src):
+        return next((e for e in self.entries if e.full_src == full_src), None)
+
+    def purge_tag(self, tag):
+        tag_id = self.tag_table.ids.get(tag)
+        if tag_id is None:
+            return
+        for entry in self.entries:
+            if tag_id in entry.tag_ids:
+                entry.tag_ids = array(TAG_ID_TYPECODE, [i for i in entry.tag_ids if i != tag_id])
+
+    def rename_tag(self, old_tag, new_tag):
+        old_id = self.tag_table.ids.get(old_tag)
+        if old_id is None:
+            return
+        new_id = self.tag_table.ids.get(new_tag)
+        if new_id is None:
+            # The new name takes over the old ID, so every entry follows along
+            self.tag_table.rename(old_id, new_tag)
+            return
+        for entry in self.entries:
+            if old_id in entry.tag_ids:
+                ids = [i for i in entry.tag_ids if i != old_id]
+                if new_id not in ids:
+                    ids.append(new_id)
+                entry.tag_ids = array(TAG_ID_TYPECODE, ids)
+
+if msgspec is not None:
+    class ArtRecord(msgspec.Struct, rename="camel", forbid_unknown_fields=True, gc=False):
+        """
+        Typed schema of one ALL_ART_JSON entry, enforcing the same rules as
+        ArtEntry.from_dict inside msgspec's decoder.
+        """
+        thumbnail_src: Annotated[str, msgspec.Meta(min_length=1)]
+        full_src: Annotated[str, msgspec.Meta(min_length=1)]
+        title: str = ""
+        description: str = ""
+        tags: list[str] = []
+        width: Optional[Annotated[int, msgspec.Meta(gt=0)]] = None
+        height: Optional[Annotated[int, msgspec.Meta(gt=0)]] = None
+        placeholder: Optional[str] = None
+
+    ART_RECORDS_DECODER = msgspec.json.Decoder(list[ArtRecord])
+    ART_RECORD_DECODER = msgspec.json.Decoder(ArtRecord)
+    RAW_LIST_DECODER = msgspec.json.Decoder(list[msgspec.Raw])
+
+@contextmanager
+def _gc_paused():
+    # Catalog records hold no reference cycles, so collections triggered by
+    # the burst of allocations during a load only cost time.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _validate_record(record):
+    # Typed records were already checked by the decoder
+    if msgspec is not None and type(record) is ArtRecord:
+        return record
+    return ArtEntry.validate(record)
+
+def decode_catalog(data, codec, source="catalog"):
+    """
+    Turns raw ALL_ART_JSON bytes into a Catalog. Codecs with typed decoding
+    validate inside the decoder; entries they can't type, and every entry
+    with the other codecs, go through ArtEntry.validate.
+    Raises the codec's decode errors, CatalogError for malformed entries,
+    or ValueError when the document is not a list.
+    """
+    with _gc_paused():
+        records = codec.decode_art_records(data)
+        if records is None:
+            records = codec.loads(data)
+            if not isinstance(records, list):
+                raise ValueError(f"expected a list, got {type(records).__name__}")
+        return Catalog.from_records(decode_records(records, _validate_record, source))
+
+# Next to each catalog file, save_catalog keeps a marshal snapshot of what it
+# wrote, together with the file's stamp. While the stamp still matches, a cold
+# load reads the snapshot instead of parsing and re-validating the JSON.
+# It is only a cache: anything wrong with it just means a normal load.
+def _snapshot_path(path):
+    return path.with_name(f".{path.name}.cache")
+
+def _read_snapshot(data, stamp):
+    saved_stamp, records = marshal.loads(data)
+    return records if saved_stamp == stamp else None
+
+def _load_snapshot(path, stamp):
+    try:
+        return _read_snapshot(_snapshot_path(path).read_bytes(), stamp)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def _save_snapshot(path, stamp, records):
+    try:
+        _snapshot_path(path).write_bytes(marshal.dumps((stamp, records)))
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not write {_snapshot_path(path).name}: {e}")
+
+# The loaded catalog is kept in memory and only re-read when the file on
+# disk changes. Hold catalog_lock (one per site) while loading, modifying
+# and saving it.
+_catalog_cache = {}
+
+def _catalog_stamp(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def load_catalog(path):
+    with catalog_lock:
+        stamp = _catalog_stamp(path)
+        cached = _catalog_cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        records = _load_snapshot(path, stamp) if stamp else None
+        try:
+            if records is not None:
+                with _gc_paused():
+                    catalog = Catalog.from_records(records)
+            else:
+                catalog = decode_catalog(path.read_bytes(), FileUtils.codec, path.name) if stamp else Catalog()
+        except CatalogError as e:
+            for problem in e.problems:
+                print(f"[ERROR] {path.name}{problem}")
+            abort(500, str(e))
+        except FileUtils.codec.decode_errors + (ValueError,) as e:
+            abort(500, f"Corrupted JSON file: {path.name}: {str(e)}")
+        _catalog_cache[path] = (stamp, catalog)
+        return catalog
+
+def save_catalog(catalog, path):
+    with catalog_lock:
+        records = catalog.to_list()
+        try:
+            FileUtils.safe_json_save(records, path)
+        except Exception:
+            # Memory and disk may now disagree; force a re-read next time.
+            _catalog_cache.pop(path, None)
+            raise
+        stamp = _catalog_stamp(path)
+        _catalog_cache[path] = (stamp, catalog)
+        _save_snapshot(path, stamp, records)
+
+class TagInfo:
+    """
+    One entry of TAG_LIST_JSON. Older tag lists stored plain name strings;
+    those are normalized to TagInfo on load and written back as objects.
+    """
+    __slots__ = ('name', 'cover_photo')
+
+    def __init__(self, name, cover_photo=""):
+        self.name = name
+        self.cover_photo = cover_photo
+
+    @classmethod
+    def from_json(cls, data):
+        if isinstance(data, str) and data:
+            return cls(data)
+        if not isinstance(data, dict) or not isinstance(data.get('name'), str) or not data['name']:
+            raise ValueError("expected a tag name or an object with a non-empty 'name'")
+        cover_photo = data.get('coverPhoto') or ""
+        if not isinstance(cover_photo, str):
+            raise ValueError("'coverPhoto' must be a string")
+        return cls(data['name'], cover_photo)
+
+    def to_dict(self):
+        return {'name': self.name, 'coverPhoto': self.cover_photo}
+
+def load_tags(path):
+    try:
+        return decode_records(FileUtils.safe_json_load(path), TagInfo.from_json, path.name)
+    except CatalogError as e:
+        for problem in e.problems:
+            print(f"[ERROR] {path.name}{problem}")
+        abort(500, str(e))
+
+def save_tags(tags, path):
+    FileUtils.safe_json_save([tag.to_dict() for tag in tags], path)
+
+def find_tag(tags, name):
+    return next((tag for tag in tags if tag.name == name), None)
+
 class ImageProcessor:
     """Handles image processing with proper thumbnail generation."""
     THUMBNAIL_WIDTH = 150
+    # Longest side of the placeholder; the gallery scales it up and blurs it.
+    PLACEHOLDER_SIZE = 6
+    PLACEHOLDER_COLORS = 16
 
     @classmethod
-    def create_thumbnail(cls, src_path, dest_dir):
+    def create_thumbnail(cls, src_path, dest_dir, width=None):
+        width = width or cls.THUMBNAIL_WIDTH
         dest_path = dest_dir / f"thumbnail_{src_path.name}"
         with Image.open(src_path) as img:
             if cls._is_animated_gif(img):
-                cls._process_animated_gif(img, dest_path)
+                cls._process_animated_gif(img, dest_path, width)
             else:
-                cls._process_static_image(img, dest_path)
+                cls._process_static_image(img, dest_path, width)
         return dest_path
 
+    @classmethod
+    def get_metadata(cls, src_path):
+        """
+        Returns the width/height of the source image and a tiny base64 GIF
+        data URI (~160 bytes) the gallery shows while the real thumbnail is loading.
+        """
+        with Image.open(src_path) as img:
+            width, height = img.size
+            # Lets the JPEG decoder skip straight to a reduced scale.
+            img.draft('RGB', (cls.PLACEHOLDER_SIZE * 2, cls.PLACEHOLDER_SIZE * 2))
+            frame = img.convert('RGB')
+        scale = cls.PLACEHOLDER_SIZE / float(max(width, height))
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        frame = frame.resize(size, Image.BILINEAR).quantize(cls.PLACEHOLDER_COLORS)
+        buffer = io.BytesIO()
+        frame.save(buffer, format='GIF', optimize=True)
+        encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+        return {
+            "width": width,
+            "height": height,
+            "placeholder": f"data:image/gif;base64,{encoded}",
+        }
+
     @staticmethod
     def _is_animated_gif(img):
         return img.format == 'GIF' and getattr(img, 'is_animated', False)
 
     @classmethod
-    def _process_animated_gif(cls, img, dest_path):
+    def _process_animated_gif(cls, img, dest_path, width):
         frames = []
         for frame in ImageSequence.Iterator(img):
-            frames.append(cls._resize_frame(frame))
+            frames.append(cls._resize_frame(frame, width))
         frames[0].save(dest_path, save_all=True, append_images=frames[1:], loop=0)
 
     @classmethod
-    def _process_static_image(cls, img, dest_path):
-        resized = cls._resize_frame(img)
+    def _process_static_image(cls, img, dest_path, width):
+        resized = cls._resize_frame(img, width)
         resized.save(dest_path)
 
-    @classmethod
-    def _resize_frame(cls, frame):
-        width_percent = cls.THUMBNAIL_WIDTH / float(frame.size[0])
+    @staticmethod
+    def _resize_frame(frame, width):
+        width_percent = width / float(frame.size[0])
         target_height = int(float(frame.size[1]) * width_percent)
-        return frame.resize((cls.THUMBNAIL_WIDTH, target_height), Image.LANCZOS)
+        return frame.resize((width, target_height), Image.LANCZOS)
 
 class NeocitiesUploader:
     def __init__(self, config):
@@ -222,74 +902,468 @@ class NeocitiesUploader:
             print(f"[ERROR] Delete failed: {e.response.text}")
             abort(500, f"Neocities delete failed: {str(e)}")
 
+    def list_files(self):
+        """
+        Returns the set of file paths currently on the site (no leading slash),
+        or None when the listing is unavailable.
+        """
+        if self.api is None:
+            print("Skipping listing: No Neocities API configured")
+            return None
+        try:
+            response = self.api.listitems()
+        except Exception as e:
+            # Connection errors and timeouts from requests as well as the
+            # neocities library's own errors: fsck just skips the remote side.
+            print(f"[ERROR] Listing failed: {type(e).__name__}: {str(e)}")
+            return None
+        if not isinstance(response, dict) or response.get('result') != 'success':
+            print(f"[ERROR] Listing failed: {response}")
+            return None
+        try:
+            return {item['path'] for item in response.get('files', []) if not item.get('is_directory')}
+        except (TypeError, KeyError, AttributeError) as e:
+            print(f"[ERROR] Listing failed: unexpected response ({str(e)})")
+            return None
+
+
+# ----------------------- SITES -----------------------
+# Credentials are never inherited from the main .env by a site profile, so a
+# profile without its own key can't upload to somebody else's site.
+SITE_ONLY_SETTINGS = ("NEOCITIES_API_KEY", "NEOCITIES_USER", "NEOCITIES_PASS")
+
+class Site:
+    """One Neocities gallery served by this process."""
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.uploader = NeocitiesUploader(config)
+        self.catalog_lock = threading.RLock()
+        # Files being written by uploads that fsck must treat as referenced
+        self.pending_files = set()
+
+    @property
+    def has_credentials(self):
+        return bool(self.config.API_KEY or (self.config.USER and self.config.PASS))
+
+def load_sites(config):
+    """
+    Builds a Site for every profile listed in SITES. Each profile lives in
+    SITES_DIR/<name>/ with its own .env, static folder and templates.
+    """
+    sites = {}
+    inherited = {k: v for k, v in os.environ.items() if k not in SITE_ONLY_SETTINGS}
+    for name in config.SITES:
+        if not re.fullmatch(r'[A-Za-z0-9_-]+', name):
+            print(f"[ERROR] Skipping site '{name}': names may only use letters, digits, '-' and '_'")
+            continue
+        site_dir = config.SITES_DIR / name
+        if not site_dir.is_dir():
+            print(f"[ERROR] Skipping site '{name}': folder {site_dir} not found")
+            continue
+        env = dict(inherited)
+        env.update({k: v for k, v in dotenv_values(site_dir / ".env").items() if v is not None})
+        site_config = Config(env=env, base_dir=site_dir)
+        if not re.fullmatch(r'(/[A-Za-z0-9_.-]+)+', site_config.STATIC_URL_PATH):
+            print(f"[ERROR] Skipping site '{name}': STATIC_URL_PATH must look like /assets, "
+                  f"got '{site_config.STATIC_URL_PATH}'")
+            continue
+
+        # Tag links are written into the gallery page, so every site needs its
+        # own copy; start it from the shared one when the profile has none.
+        if not site_config.ART_HTML.exists() and config.ART_HTML.exists():
+            shutil.copyfile(config.ART_HTML, site_config.ART_HTML)
+            print(f"Site '{name}': copied {config.ART_HTML.name} from the shared templates")
+        for template, shared in ((site_config.ART_HTML, None), (site_config.TAG_TEMPLATE, config.TAG_TEMPLATE)):
+            if not template.exists() and not (shared and shared.exists()):
+                print(f"[ERROR] Site '{name}' has no {template.name}; creating and editing tags will fail")
+        sites[name] = Site(name, site_config)
+    return sites
+
+def current_site():
+    """The site selected by the current request (or CLI command)."""
+    site = g.get('site') if has_app_context() else None
+    if site is None:
+        site = default_site
+    if site is None:
+        abort(404, "No site selected")
+    return site
+
+# Initialize configuration and sites. server_cfg holds the process-wide
+# settings; in single-site mode it is also the only site's config.
+server_cfg = Config()
+ImageProcessor.THUMBNAIL_WIDTH = server_cfg.THUMBNAIL_WIDTH
+FileUtils.codec = get_codec(server_cfg.JSON_CODEC)
+
+sites = load_sites(server_cfg)
+default_site = None if server_cfg.SITES else Site("", server_cfg)
+
+# Routes and helpers use these; they resolve to the current site's objects.
+cfg = LocalProxy(lambda: current_site().config)
+uploader = LocalProxy(lambda: current_site().uploader)
+catalog_lock = LocalProxy(lambda: current_site().catalog_lock)
+
+if default_site:
+    app = Flask(
+        __name__,
+        static_url_path=server_cfg.STATIC_URL_PATH,
+        static_folder=str(server_cfg.STATIC_FOLDER)
+    )
+else:
+    # Each site's assets are served under its own prefix instead.
+    app = Flask(__name__, static_folder=None)
+
+# Pillow work and Neocities uploads from every site share these bounded
+# pools, so CPU and memory follow the actual load, not the number of sites.
+thumbnail_pool = ThreadPoolExecutor(max_workers=server_cfg.THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+upload_pool = ThreadPoolExecutor(max_workers=server_cfg.UPLOAD_WORKERS, thread_name_prefix="upload")
 
-# Initialize configuration and uploader
-cfg = Config()
-ImageProcessor.THUMBNAIL_WIDTH = cfg.THUMBNAIL_WIDTH
-app = Flask(
-    __name__,
-    static_url_path=cfg.STATIC_URL_PATH,
-    static_folder=str(cfg.STATIC_FOLDER)
-)
-uploader = NeocitiesUploader(cfg)
+def run_in_thumbnail_pool(func, *args):
+    """Runs image processing on the shared thumbnail pool and waits for the result."""
+    return thumbnail_pool.submit(func, *args).result()
+
+def _make_thumbnail(src_path, dest_dir, width):
+    return ImageProcessor.create_thumbnail(src_path, dest_dir, width), ImageProcessor.get_metadata(src_path)
 
 # ------------------------------------------------------------------------------
 # HELPER FUNCTION TO WRAP ALL UPLOADER.UPLOAD CALLS
 # ------------------------------------------------------------------------------
 def perform_upload(upload_items):
     """
-    Accepts a list of tuples (local_path, remote_path) and performs uploader.upload on each.
+    Accepts a list of tuples (local_path, remote_path) and uploads them on the
+    shared upload pool. Pages and JSON reference the media, so they are only
+    sent once every other file has been uploaded.
     """
+    site_uploader = current_site().uploader
+    media, pages = [], []
     for local_path, remote_path in upload_items:
         # Only attempt upload if the file exists.
         if local_path.exists():
-            uploader.upload(local_path, remote_path)
+            group = pages if local_path.suffix in ('.json', '.html') else media
+            group.append((local_path, remote_path))
         else:
             print(f"Skipping upload for {local_path} as it does not exist.")
 
+    for group in (media, pages):
+        futures = [upload_pool.submit(site_uploader.upload, local_path, remote_path)
+                   for local_path, remote_path in group]
+        for future in futures:
+            future.result()
+
 def _process_tags(tags_str):
     return [t.strip() for t in tags_str.split(",") if t.strip()]
 
+# ----------------------- INTEGRITY CHECK -----------------------
+FSCK_WORKERS = 4
+FSCK_DELETE_BATCH = 50
+
+def _list_local(directory):
+    return {p.name for p in directory.iterdir() if p.is_file()}
+
+def _remote(path):
+    return path.strip('/')
+
+@contextmanager
+def protect_from_fsck(*paths):
+    """
+    Marks files a request is about to write as referenced until the entry
+    pointing at them has been saved, so a concurrent fsck repair never
+    mistakes them for orphans.
+    """
+    site = current_site()
+    with site.catalog_lock:
+        site.pending_files.update(paths)
+    try:
+        yield
+    finally:
+        with site.catalog_lock:
+            site.pending_files.difference_update(paths)
+
+def _asset_dirs(config):
+    return [
+        (config.ART_DIR, config.NEOCITIES_ART_DIR),
+        (config.THUMB_DIR, config.NEOCITIES_THUMB_DIR),
+        (config.TAG_COVERS_DIR, config.NEOCITIES_TAG_COVERS_DIR),
+    ]
+
+def _overlapping_dirs(config):
+    """True when two asset kinds share a local folder or a Neocities folder."""
+    dirs = _asset_dirs(config)
+    return (len({local_dir.resolve() for local_dir, _ in dirs}) < len(dirs)
+            or len({_remote(remote_dir) for _, remote_dir in dirs}) < len(dirs))
+
+def _referenced(site):
+    """
+    Returns the file names referenced by the catalog, the tag list and any
+    upload in progress, keyed by resolved local folder and by remote folder.
+    Folders shared by several asset kinds get the union of their names.
+    Call with catalog_lock held.
+    """
+    config = site.config
+    catalog = load_catalog(config.ALL_ART_JSON)
+    tags = load_tags(config.TAG_LIST_JSON)
+    names = [
+        {e.full_name for e in catalog},
+        {e.thumb_name for e in catalog},
+        {Path(t.cover_photo).name for t in tags if t.cover_photo},
+    ]
+    local, remote = defaultdict(set), defaultdict(set)
+    for (local_dir, remote_dir), referenced in zip(_asset_dirs(config), names):
+        local[local_dir.resolve()] |= referenced
+        remote[_remote(remote_dir)] |= referenced
+    for path in site.pending_files:
+        local[path.parent.resolve()].add(path.name)
+    return local, remote
+
+def run_fsck(repair=False):
+    """
+    Cross-checks the local asset folders and the Neocities listing against
+    ALL_ART_JSON/TAG_LIST_JSON. Returns a report; when repair is True it also
+    regenerates missing thumbnails, re-uploads files missing remotely and
+    deletes orphans both locally and on Neocities.
+
+    catalog_lock is only held to snapshot the catalog and to apply the
+    repairs, never across the Neocities listing, uploads or deletes.
+    """
+    site = current_site()
+    config = site.config
+    overlapping = _overlapping_dirs(config)
+
+    with site.catalog_lock:
+        entries = [(e.full_src, e.thumbnail_src, e.full_name, e.thumb_name, e.placeholder is None)
+                   for e in load_catalog(config.ALL_ART_JSON)]
+        local_refs, remote_refs = _referenced(site)
+
+    # Scan the local folders and fetch the remote listing at the same time
+    local_dirs = list(dict.fromkeys(local_dir.resolve() for local_dir, _ in _asset_dirs(config)))
+    remote_dirs = list(dict.fromkeys(_remote(remote_dir) for _, remote_dir in _asset_dirs(config)))
+    with ThreadPoolExecutor(max_workers=FSCK_WORKERS) as pool:
+        remote_future = pool.submit(site.uploader.list_files)
+        local_futures = {local_dir: pool.submit(_list_local, local_dir) for local_dir in local_dirs}
+        local_files = {local_dir: f.result() for local_dir, f in local_futures.items()}
+        remote_files = remote_future.result()
+
+    local_orphans = [local_dir / name for local_dir in local_dirs
+                     for name in sorted(local_files[local_dir] - local_refs[local_dir])]
+    remote_orphans = []
+    if remote_files is not None:
+        for remote_dir in remote_dirs:
+            remote_orphans += sorted(
+                p for p in remote_files
+                if posixpath.dirname(p) == remote_dir and posixpath.basename(p) not in remote_refs[remote_dir]
+            )
+
+    local_art = local_files[config.ART_DIR.resolve()]
+    local_thumbs = local_files[config.THUMB_DIR.resolve()]
+    missing_media = []
+    missing_thumbs = []
+    missing_metadata = []
+    missing_remote = []
+    for full_src, thumbnail_src, full_name, thumb_name, no_metadata in entries:
+        if full_name not in local_art:
+            if remote_files is None or _remote(full_src) not in remote_files:
+                missing_media.append(full_src)
+            continue
+        if thumb_name not in local_thumbs:
+            missing_thumbs.append((full_src, thumbnail_src))
+        elif remote_files is not None and _remote(thumbnail_src) not in remote_files:
+            missing_remote.append((config.THUMB_DIR / thumb_name, thumbnail_src))
+        if remote_files is not None and _remote(full_src) not in remote_files:
+            missing_remote.append((config.ART_DIR / full_name, full_src))
+        if no_metadata:
+            missing_metadata.append(full_src)
+
+    report = {
+        "repaired": repair,
+        "remoteChecked": remote_files is not None,
+        "overlappingDirectories": overlapping,
+        "localOrphans": [str(p.relative_to(config.STATIC_FOLDER.resolve())) for p in local_orphans],
+        "remoteOrphans": remote_orphans,
+        "missingMedia": missing_media,
+        "missingThumbnails": [thumbnail_src for _, thumbnail_src in missing_thumbs],
+        "missingMetadata": missing_metadata,
+        "missingRemote": [remote_path for _, remote_path in missing_remote],
+    }
+    if repair and overlapping:
+        # A shared folder makes one kind's files look like another kind's
+        # orphans; nothing is deleted until the configuration is fixed.
+        report["repaired"] = False
+        report["error"] = ("Refusing to repair: the art, thumbnail and tag cover folders must be "
+                           "distinct both locally and on Neocities")
+    if not report["repaired"]:
+        return report
+
+    # Thumbnails and metadata are rebuilt from the local originals on the shared thumbnail pool
+    def regenerate(item):
+        full_src, _ = item
+        full_name = posixpath.basename(full_src)
+        return full_src, ImageProcessor.create_thumbnail(config.ART_DIR / full_name, config.THUMB_DIR,
+                                                         config.THUMBNAIL_WIDTH)
+
+    def backfill(full_src):
+        return full_src, ImageProcessor.get_metadata(config.ART_DIR / posixpath.basename(full_src))
+
+    thumbnails = list(thumbnail_pool.map(regenerate, missing_thumbs))
+    metadata = list(thumbnail_pool.map(backfill, missing_metadata))
+
+    upload_items = list(missing_remote)
+    with site.catalog_lock:
+        # Entries may have changed since the snapshot; only update those still present
+        catalog = load_catalog(config.ALL_ART_JSON)
+        for full_src, thumb_path in thumbnails:
+            entry = catalog.find(full_src)
+            if entry is not None:
+                entry.thumbnail_src = f"{config.NEOCITIES_THUMB_DIR}/{thumb_path.name}"
+                upload_items.append((thumb_path, entry.thumbnail_src))
+        for full_src, entry_metadata in metadata:
+            entry = catalog.find(full_src)
+            if entry is not None:
+                entry.set_metadata(entry_metadata)
+        if thumbnails or metadata:
+            save_catalog(catalog, config.ALL_ART_JSON)
+            upload_items.append((config.ALL_ART_JSON, f"{config.NEOCITIES_JSON_DIR}/{config.ALL_ART_JSON.name}"))
+
+        # Anything uploaded or referenced since the snapshot is no longer an orphan
+        local_refs, remote_refs = _referenced(site)
+        for path in local_orphans:
+            if path.name not in local_refs[path.parent]:
+                path.unlink(missing_ok=True)
+        remote_orphans = [p for p in remote_orphans
+                          if posixpath.basename(p) not in remote_refs[posixpath.dirname(p)]]
+
+    perform_upload(upload_items)
+
+    for i in range(0, len(remote_orphans), FSCK_DELETE_BATCH):
+        site.uploader.delete(remote_orphans[i:i + FSCK_DELETE_BATCH])
+
+    return report
+
+# ----------------------- CATALOG BENCHMARK -----------------------
+def _synthetic_catalog(count):
+    tag_pool = [f"tag{i}" for i in range(50)]
+    # A real placeholder, so the numbers include what upload_art stores
+    source = io.BytesIO()
+    Image.radial_gradient('L').convert('RGB').resize((800, 600)).save(source, format='PNG')
+    placeholder = ImageProcessor.get_metadata(source)["placeholder"]
+    return [{
+        "thumbnailSrc": f"{server_cfg.NEOCITIES_THUMB_DIR}/thumbnail_art{i}.png",
+        "fullSrc": f"{server_cfg.NEOCITIES_ART_DIR}/art{i}.png",
+        "title": f"Art {i}",
+        "description": f"Description for art {i}",
+        "tags": [tag_pool[(i * k) % len(tag_pool)] for k in (1, 3, 7)],
+        "width": 800,
+        "height": 600,
+        "placeholder": placeholder,
+    } for i in range(count)]
+
+def benchmark_catalog(count=100000):
+    """
+    Builds a synthetic catalog of `count` entries and prints the bytes per
+    entry held by the plain list of dicts versus the compact Catalog.
+    """
+    raw = json.dumps(_synthetic_catalog(count))
+
+    def measure(build):
+        tracemalloc.start()
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return result, size
+
+    _, dict_bytes = measure(lambda: json.loads(raw))
+    _, catalog_bytes = measure(lambda: Catalog.from_list(json.loads(raw)))
+
+    print(f"Entries:        {count}")
+    print(f"list of dicts:  {dict_bytes / count:.0f} bytes/entry")
+    print(f"Catalog:        {catalog_bytes / count:.0f} bytes/entry")
+    print(f"Reduction:      {dict_bytes / catalog_bytes:.1f}x")
+
+def benchmark_codecs(count=100000):
+    """
+    Times loading (parse + validate into a Catalog), a cold load from the
+    snapshot save_catalog keeps next to an unchanged file, and saving
+    (serialize, plus the snapshot) a synthetic catalog of `count` entries
+    with every installed codec. Each codec loads the file as it writes it.
+    """
+    entries = _synthetic_catalog(count)
+    raw = json.dumps(entries, indent=2).encode('utf-8')
+
+    def best_of(func, runs=5):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    catalog = Catalog.from_list(entries)
+    stamp = (0, 0)
+    snapshot = marshal.dumps((stamp, catalog.to_list()))
+
+    def load_snapshot():
+        with _gc_paused():
+            return Catalog.from_records(_read_snapshot(snapshot, stamp))
+
+    def save(codec):
+        records = catalog.to_list()
+        codec.dumps(records)
+        marshal.dumps((stamp, records))
+
+    # What FileUtils did before codecs existed: stdlib json into plain dicts.
+    print(f"Entries: {count}")
+    print(f"{'codec':<18}{'parse ms':>10}{'load ms':>10}{'save ms':>10}")
+    print(f"{'json (dicts)':<18}{best_of(lambda: json.loads(raw)):>10.0f}{'-':>10}"
+          f"{best_of(lambda: json.dumps(entries, indent=2)):>10.0f}")
+    print(f"{'snapshot':<18}{'-':>10}{best_of(load_snapshot):>10.0f}{'-':>10}")
+
+    for name, (codec_class, available) in JSON_CODECS.items():
+        if not available():
+            print(f"{name:<18}{'not installed':>30}")
+            continue
+        codec = codec_class()
+        saved = codec.dumps(catalog.to_list())
+        parse_ms = best_of(lambda: codec.loads(saved))
+        load_ms = best_of(lambda: decode_catalog(saved, codec))
+        save_ms = best_of(lambda: save(codec))
+        print(f"{name:<18}{parse_ms:>10.0f}{load_ms:>10.0f}{save_ms:>10.0f}")
+
 # ----------------------- ROUTES -----------------------
-@app.route("/")
+# Mounted at / for a single site, or at /<site>/ in multi-site mode.
+gallery = Blueprint('gallery', __name__)
+
+@gallery.url_value_preprocessor
+def select_site(endpoint, values):
+    if values and 'site' in values:
+        site = sites.get(values.pop('site'))
+        if site is None:
+            abort(404, "Unknown site")
+        g.site = site
+
+def _tag_template():
+    # Site profiles may keep their own tag template but fall back to the shared one.
+    return cfg.TAG_TEMPLATE if cfg.TAG_TEMPLATE.exists() else server_cfg.TAG_TEMPLATE
+
+@gallery.route("/")
 def index():
-    return cfg.INDEX_HTML.read_text(encoding='utf-8')
+    # Site profiles may keep their own admin page but fall back to the shared one.
+    index_html = cfg.INDEX_HTML if cfg.INDEX_HTML.exists() else server_cfg.INDEX_HTML
+    return index_html.read_text(encoding='utf-8')
 
-@app.route("/tags")
+@gallery.route("/tags")
 def get_tags():
-    tags = FileUtils.safe_json_load(cfg.TAG_LIST_JSON)
-    
-    # Convert to simple list for backward compatibility
-    tag_names = []
-    for tag in tags:
-        if isinstance(tag, str):
-            tag_names.append(tag)
-        elif isinstance(tag, dict):
-            tag_names.append(tag.get('name'))
+    tags = load_tags(cfg.TAG_LIST_JSON)
     
     return jsonify({
-        "tags": sorted(tag_names),
+        "tags": sorted(tag.name for tag in tags),
         "randomTag": cfg.SHOW_IN_RANDOM
     })
 
-@app.route("/get_tag/<tag_name>")
+@gallery.route("/get_tag/<tag_name>")
 def get_tag(tag_name):
-    tags = FileUtils.safe_json_load(cfg.TAG_LIST_JSON)
-    
-    # Find tag info (handle both string and dict formats)
-    tag_info = None
-    cover_photo = ""
-    for tag in tags:
-        if isinstance(tag, str) and tag == tag_name:
-            tag_info = tag
-            break
-        elif isinstance(tag, dict) and tag.get('name') == tag_name:
-            tag_info = tag.get('name')
-            cover_photo = tag.get('coverPhoto', '')
-            break
-    
+    tag_info = find_tag(load_tags(cfg.TAG_LIST_JSON), tag_name)
     if not tag_info:
         return jsonify({"error": f"Tag '{tag_name}' not found in registry"}), 404
+    cover_photo = tag_info.cover_photo
     
     tag_html_path = cfg.TEMPLATE_DIR / f"{tag_name}.html"
     if not tag_html_path.exists():
@@ -327,7 +1401,7 @@ def get_tag(tag_name):
         "coverPhoto": cover_photo
     })
 
-@app.route("/upload", methods=["POST"])
+@gallery.route("/upload", methods=["POST"])
 def upload_art():
     file = request.files.get("image")
     if not file or file.filename == '':
@@ -338,20 +1412,40 @@ def upload_art():
         abort(400, "Invalid filename")
 
     art_path = cfg.ART_DIR / filename
-    file.save(art_path)
-
-    thumb_path = ImageProcessor.create_thumbnail(art_path, cfg.THUMB_DIR)
-
-    art_data = FileUtils.safe_json_load(cfg.ALL_ART_JSON)
-    chosen_tags = request.form.get("chosen_tags", "")
-    art_data.append({
-        "thumbnailSrc": f"{cfg.NEOCITIES_THUMB_DIR}/{thumb_path.name}",
-        "fullSrc": f"{cfg.NEOCITIES_ART_DIR}/{filename}",
-        "title": request.form.get("title", ""),
-        "description": request.form.get("description", ""),
-        "tags": _process_tags(chosen_tags),
-    })
-    FileUtils.safe_json_save(art_data, cfg.ALL_ART_JSON)
+    tags = _process_tags(request.form.get("chosen_tags", ""))
+
+    # Tags the catalog has no room for are rejected before any file is written
+    with catalog_lock:
+        try:
+            load_catalog(cfg.ALL_ART_JSON).intern_tags(tags)
+        except ValueError as e:
+            abort(400, f"Invalid tags: {e}")
+
+    with protect_from_fsck(art_path, cfg.THUMB_DIR / f"thumbnail_{filename}"):
+        file.save(art_path)
+
+        thumb_path, metadata = run_in_thumbnail_pool(_make_thumbnail, art_path, cfg.THUMB_DIR, cfg.THUMBNAIL_WIDTH)
+
+        with catalog_lock:
+            catalog = load_catalog(cfg.ALL_ART_JSON)
+            try:
+                catalog.add(ArtEntry(
+                    thumbnail_src=f"{cfg.NEOCITIES_THUMB_DIR}/{thumb_path.name}",
+                    full_src=f"{cfg.NEOCITIES_ART_DIR}/{filename}",
+                    title=request.form.get("title", ""),
+                    description=request.form.get("description", ""),
+                    tags=tags,
+                    width=metadata["width"],
+                    height=metadata["height"],
+                    placeholder=metadata["placeholder"],
+                    tag_table=catalog.tag_table,
+                ))
+            except ValueError as e:
+                # The catalog was reloaded from disk since the check above
+                art_path.unlink(missing_ok=True)
+                thumb_path.unlink(missing_ok=True)
+                abort(400, f"Invalid tags: {e}")
+            save_catalog(catalog, cfg.ALL_ART_JSON)
 
     # Upload to Neocities using perform_upload helper
     perform_upload([
@@ -362,7 +1456,7 @@ def upload_art():
 
     return f"Successfully uploaded {filename}"
 
-@app.route("/create_tag", methods=["POST"])
+@gallery.route("/create_tag", methods=["POST"])
 def create_tag():
     # Handle both JSON and FormData
     if request.content_type and 'multipart/form-data' in request.content_type:
@@ -385,51 +1479,51 @@ def create_tag():
     
     # Process cover photo if provided
     cover_photo_path = ""
+    cover_paths = ()
     if cover_file and cover_file.filename:
-        # Create thumbnail for cover photo
         cover_filename = f"cover_{data['tagName']}_{secure_filename(cover_file.filename)}"
         temp_path = cfg.TAG_COVERS_DIR / "temp_cover.png"
-        cover_file.save(temp_path)
-        
-        # Create thumbnail (no full-size version needed)
-        cover_thumb_path = ImageProcessor.create_thumbnail(temp_path, cfg.TAG_COVERS_DIR)
         final_cover_path = cfg.TAG_COVERS_DIR / cover_filename
-        cover_thumb_path.rename(final_cover_path)
-        temp_path.unlink()  # Remove temp file
+        cover_paths = (temp_path, cfg.TAG_COVERS_DIR / f"thumbnail_{temp_path.name}", final_cover_path)
+
+    # The cover files are protected from fsck until the tag list references them
+    with protect_from_fsck(*cover_paths):
+        if cover_paths:
+            # Create thumbnail for cover photo
+            cover_file.save(temp_path)
+            
+            # Create thumbnail (no full-size version needed)
+            cover_thumb_path = run_in_thumbnail_pool(
+                ImageProcessor.create_thumbnail, temp_path, cfg.TAG_COVERS_DIR, cfg.THUMBNAIL_WIDTH)
+            cover_thumb_path.rename(final_cover_path)
+            temp_path.unlink()  # Remove temp file
         
-        cover_photo_path = f"{cfg.NEOCITIES_TAG_COVERS_DIR}/{cover_filename}"
+            cover_photo_path = f"{cfg.NEOCITIES_TAG_COVERS_DIR}/{cover_filename}"
         
-    # Create the tag page with cover photo
-    tag_page = cfg.TEMPLATE_DIR / f"{data['tagName']}.html"
-    tag_template = cfg.TAG_TEMPLATE.read_text(encoding='utf-8')
-    tag_template = (
-        tag_template
-        .replace("__DATA_TAG__", data['tagName'])
-        .replace("__META_DESC__", data['metaDesc'])
-        .replace("__PAGE_TITLE__", data['pageTitle'])
-        .replace("__COVER_PHOTO__", cover_photo_path)
-        .replace("__NEOCITIES_GALLERY_DIR__", cfg.get_gallery_dir())
-        .replace("__GALLERY_PAGE__", cfg.ART_HTML.name)
-    )
-    tag_page.write_text(tag_template, encoding='utf-8')
+        # Create the tag page with cover photo
+        tag_page = cfg.TEMPLATE_DIR / f"{data['tagName']}.html"
+        tag_template = _tag_template().read_text(encoding='utf-8')
+        tag_template = (
+            tag_template
+            .replace("__DATA_TAG__", data['tagName'])
+            .replace("__META_DESC__", data['metaDesc'])
+            .replace("__PAGE_TITLE__", data['pageTitle'])
+            .replace("__COVER_PHOTO__", cover_photo_path)
+            .replace("__NEOCITIES_GALLERY_DIR__", cfg.get_gallery_dir())
+            .replace("__GALLERY_PAGE__", cfg.ART_HTML.name)
+        )
+        tag_page.write_text(tag_template, encoding='utf-8')
     
-    _update_art_html(data['tagName'], data['linkTitle'], cover_photo_path)
+        _update_art_html(data['tagName'], data['linkTitle'], cover_photo_path)
     
-    # Update tags list with cover photo info
-    tags = FileUtils.safe_json_load(cfg.TAG_LIST_JSON)
-    tag_info = {
-        'name': data['tagName'],
-        'coverPhoto': cover_photo_path
-    }
+        # Update tags list with cover photo info
+        tags = load_tags(cfg.TAG_LIST_JSON)
     
-    # Check if tag already exists
-    existing_tag = next((t for t in tags if isinstance(t, dict) and t.get('name') == data['tagName']), None)
-    if not existing_tag:
-        # For backward compatibility, check if it's a string
-        if data['tagName'] not in [t if isinstance(t, str) else t.get('name') for t in tags]:
-            tags.append(tag_info)
+        # Check if tag already exists
+        if not find_tag(tags, data['tagName']):
+            tags.append(TagInfo(data['tagName'], cover_photo_path))
     
-    FileUtils.safe_json_save(tags, cfg.TAG_LIST_JSON)
+        save_tags(tags, cfg.TAG_LIST_JSON)
     
     # Upload files
     upload_items = [
@@ -470,32 +1564,23 @@ def _update_art_html(tag_name, link_title, cover_photo_path):
 
 
 
-@app.route("/delete_tag", methods=["POST"])
+@gallery.route("/delete_tag", methods=["POST"])
 def delete_tag():
     data = request.get_json()
     if not data or 'tagName' not in data:
         abort(400, "Missing tag name")
     
     tag_name = data['tagName']
-    tags = FileUtils.safe_json_load(cfg.TAG_LIST_JSON)
-    
-    # Find and remove tag (handle both string and dict formats)
-    tag_to_remove = None
-    cover_photo_path = ""
-    for i, tag in enumerate(tags):
-        if isinstance(tag, str) and tag == tag_name:
-            tag_to_remove = i
-            break
-        elif isinstance(tag, dict) and tag.get('name') == tag_name:
-            tag_to_remove = i
-            cover_photo_path = tag.get('coverPhoto', '')
-            break
+    tags = load_tags(cfg.TAG_LIST_JSON)
     
+    # Find and remove tag
+    tag_to_remove = find_tag(tags, tag_name)
     if tag_to_remove is None:
         abort(404, f"Tag {tag_name} not found")
+    cover_photo_path = tag_to_remove.cover_photo
     
-    tags.pop(tag_to_remove)
-    FileUtils.safe_json_save(tags, cfg.TAG_LIST_JSON)
+    tags.remove(tag_to_remove)
+    save_tags(tags, cfg.TAG_LIST_JSON)
     
     tag_page = cfg.TEMPLATE_DIR / f"{tag_name}.html"
     if tag_page.exists():
@@ -539,13 +1624,12 @@ def remove_tag_from_art_html(tag_name):
     cfg.ART_HTML.write_text(updated_content, encoding='utf-8')
 
 def purge_tag_from_art_entries(tag_name):
-    art_data = FileUtils.safe_json_load(cfg.ALL_ART_JSON)
-    for entry in art_data:
-        if tag_name in entry['tags']:
-            entry['tags'].remove(tag_name)
-    FileUtils.safe_json_save(art_data, cfg.ALL_ART_JSON)
+    with catalog_lock:
+        catalog = load_catalog(cfg.ALL_ART_JSON)
+        catalog.purge_tag(tag_name)
+        save_catalog(catalog, cfg.ALL_ART_JSON)
 
-@app.route("/edit_tag", methods=["POST"])
+@gallery.route("/edit_tag", methods=["POST"])
 def edit_tag():
     # Handle both JSON and FormData
     if request.content_type and 'multipart/form-data' in request.content_type:
@@ -571,63 +1655,56 @@ def edit_tag():
     page_title = data['pageTitle']
     link_title = data['linkTitle']
     
-    tags = FileUtils.safe_json_load(cfg.TAG_LIST_JSON)
+    tags = load_tags(cfg.TAG_LIST_JSON)
     
     # Find existing tag
-    tag_index = None
-    existing_cover = ""
-    for i, tag in enumerate(tags):
-        if isinstance(tag, str) and tag == old_tag:
-            tag_index = i
-            break
-        elif isinstance(tag, dict) and tag.get('name') == old_tag:
-            tag_index = i
-            existing_cover = tag.get('coverPhoto', '')
-            break
-    
-    if tag_index is None:
+    tag_info = find_tag(tags, old_tag)
+    if tag_info is None:
         abort(404, f"Tag {old_tag} not found")
+    existing_cover = tag_info.cover_photo
     
     # Check if new tag name already exists (if renaming)
-    if old_tag != new_tag:
-        for tag in tags:
-            tag_name = tag if isinstance(tag, str) else tag.get('name')
-            if tag_name == new_tag:
-                abort(400, f"Tag {new_tag} already exists")
+    if old_tag != new_tag and find_tag(tags, new_tag):
+        abort(400, f"Tag {new_tag} already exists")
     
     # Process new cover photo if provided
     new_cover_path = existing_cover
+    cover_paths = ()
     if cover_file and cover_file.filename:
-        # Delete old cover if exists
-        if existing_cover:
-            old_cover_local = cfg.TAG_COVERS_DIR / Path(existing_cover).name
-            if old_cover_local.exists():
-                old_cover_local.unlink()
-        
-        # Create new cover
         cover_filename = f"cover_{new_tag}_{secure_filename(cover_file.filename)}"
         temp_path = cfg.TAG_COVERS_DIR / "temp_cover.png"
-        cover_file.save(temp_path)
-        
-        cover_thumb_path = ImageProcessor.create_thumbnail(temp_path, cfg.TAG_COVERS_DIR)
         final_cover_path = cfg.TAG_COVERS_DIR / cover_filename
-        cover_thumb_path.rename(final_cover_path)
-        temp_path.unlink()
+        cover_paths = (temp_path, cfg.TAG_COVERS_DIR / f"thumbnail_{temp_path.name}", final_cover_path)
+
+    # The cover files are protected from fsck until the tag list references them
+    with protect_from_fsck(*cover_paths):
+        if cover_paths:
+            # Delete old cover if exists
+            if existing_cover:
+                old_cover_local = cfg.TAG_COVERS_DIR / Path(existing_cover).name
+                if old_cover_local.exists():
+                    old_cover_local.unlink()
+            
+            # Create new cover
+            cover_file.save(temp_path)
+            
+            cover_thumb_path = run_in_thumbnail_pool(
+                ImageProcessor.create_thumbnail, temp_path, cfg.TAG_COVERS_DIR, cfg.THUMBNAIL_WIDTH)
+            cover_thumb_path.rename(final_cover_path)
+            temp_path.unlink()
+            
+            new_cover_path = f"{cfg.NEOCITIES_TAG_COVERS_DIR}/{cover_filename}"
         
-        new_cover_path = f"{cfg.NEOCITIES_TAG_COVERS_DIR}/{cover_filename}"
-    
-    # Update tag in list
-    tags[tag_index] = {
-        'name': new_tag,
-        'coverPhoto': new_cover_path
-    }
-    FileUtils.safe_json_save(tags, cfg.TAG_LIST_JSON)
+        # Update tag in list
+        tag_info.name = new_tag
+        tag_info.cover_photo = new_cover_path
+        save_tags(tags, cfg.TAG_LIST_JSON)
     
     # Update HTML files
     old_html = cfg.TEMPLATE_DIR / f"{old_tag}.html"
     new_html = cfg.TEMPLATE_DIR / f"{new_tag}.html"
     
-    tag_content = cfg.TAG_TEMPLATE.read_text(encoding='utf-8')
+    tag_content = _tag_template().read_text(encoding='utf-8')
     updated_content = (
         tag_content
         .replace("__DATA_TAG__", new_tag)
@@ -660,12 +1737,10 @@ def edit_tag():
     
     # Update art entries if tag name changed
     if old_tag != new_tag:
-        art_data = FileUtils.safe_json_load(cfg.ALL_ART_JSON)
-        for entry in art_data:
-            if old_tag in entry['tags']:
-                entry['tags'].remove(old_tag)
-                entry['tags'].append(new_tag)
-        FileUtils.safe_json_save(art_data, cfg.ALL_ART_JSON)
+        with catalog_lock:
+            catalog = load_catalog(cfg.ALL_ART_JSON)
+            catalog.rename_tag(old_tag, new_tag)
+            save_catalog(catalog, cfg.ALL_ART_JSON)
     
     # Prepare uploads
     upload_items = [
@@ -693,43 +1768,45 @@ def edit_tag():
     return jsonify({"message": f"Tag {old_tag} updated successfully"})
 
 
-@app.route("/all_art")
+@gallery.route("/all_art")
 def get_all_art():
-    art_data = FileUtils.safe_json_load(cfg.ALL_ART_JSON)
+    catalog = load_catalog(cfg.ALL_ART_JSON)
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', cfg.DEFAULT_PER_PAGE, type=int)
 
     page = max(1, page)
-    reversed_data = list(reversed(art_data))
-    total_entries = len(reversed_data)
+    per_page = max(1, per_page)
+    total_entries = len(catalog)
     total_pages = max(1, (total_entries + per_page - 1) // per_page)
     page = min(page, total_pages)
 
-    start = (page - 1) * per_page
-    end = start + per_page
+    # Newest first; only the requested page is turned back into dicts
+    end = total_entries - (page - 1) * per_page
+    start = max(0, end - per_page)
     
     return jsonify({
-        'artEntries': reversed_data[start:end],
+        'artEntries': [entry.to_dict() for entry in reversed(catalog.entries[start:end])],
         'totalPages': total_pages,
         'currentPage': page
     })
 
-@app.route("/delete_art", methods=["POST"])
+@gallery.route("/delete_art", methods=["POST"])
 def delete_art():
     data = request.get_json()
     if not data or 'fullSrc' not in data:
         abort(400, "Missing art reference")
 
-    art_data = FileUtils.safe_json_load(cfg.ALL_ART_JSON)
-    entry = next((e for e in art_data if e['fullSrc'] == data['fullSrc']), None)
-    if not entry:
-        abort(404, "Art entry not found")
+    with catalog_lock:
+        catalog = load_catalog(cfg.ALL_ART_JSON)
+        entry = catalog.find(data['fullSrc'])
+        if not entry:
+            abort(404, "Art entry not found")
 
-    art_data.remove(entry)
-    FileUtils.safe_json_save(art_data, cfg.ALL_ART_JSON)
+        catalog.remove(entry)
+        save_catalog(catalog, cfg.ALL_ART_JSON)
 
-    art_file = cfg.ART_DIR / Path(entry['fullSrc']).name
-    thumb_file = cfg.THUMB_DIR / Path(entry['thumbnailSrc']).name
+    art_file = cfg.ART_DIR / entry.full_name
+    thumb_file = cfg.THUMB_DIR / entry.thumb_name
     art_file.unlink(missing_ok=True)
     thumb_file.unlink(missing_ok=True)
 
@@ -742,38 +1819,102 @@ def delete_art():
     ])
     return jsonify({"message": f"Deleted {art_file.name}"})
 
-@app.route("/edit_art", methods=["POST"])
+@gallery.route("/edit_art", methods=["POST"])
 def edit_art():
     data = request.get_json()
     if not data or 'originalSrc' not in data:
         abort(400, "Missing art reference")
 
-    art_data = FileUtils.safe_json_load(cfg.ALL_ART_JSON)
-    entry = next((e for e in art_data if e['fullSrc'] == data['originalSrc']), None)
-    if not entry:
-        abort(404, "Art entry not found")
+    with catalog_lock:
+        catalog = load_catalog(cfg.ALL_ART_JSON)
+        entry = catalog.find(data['originalSrc'])
+        if not entry:
+            abort(404, "Art entry not found")
 
-    entry['title'] = data.get('title', entry['title'])
-    entry['description'] = data.get('description', entry['description'])
-    new_tags_str = ",".join(data.get('tags', entry['tags']))
-    entry['tags'] = _process_tags(new_tags_str)
+        # Checked with the same rules as loading, so a bad edit can never be saved
+        updated = entry.to_dict()
+        updated.update({key: data[key] for key in ('title', 'description', 'tags') if key in data})
+        try:
+            edited = ArtEntry.from_dict(updated)
+        except ValueError as e:
+            abort(400, f"Invalid art entry: {e}")
+
+        tags = _process_tags(",".join(edited.tags))
+        try:
+            catalog.intern_tags(tags)
+        except ValueError as e:
+            abort(400, f"Invalid tags: {e}")
 
-    FileUtils.safe_json_save(art_data, cfg.ALL_ART_JSON)
+        entry.title = edited.title
+        entry.description = edited.description
+        entry.tags = tags
+
+        save_catalog(catalog, cfg.ALL_ART_JSON)
     perform_upload([
         (cfg.ALL_ART_JSON, f"{cfg.NEOCITIES_JSON_DIR}/{cfg.ALL_ART_JSON.name}")
     ])
 
     return jsonify({"message": "Art updated successfully"})
 
+@gallery.route("/fsck", methods=["GET", "POST"])
+def fsck():
+    # GET only reports problems, POST also repairs them
+    report = run_fsck(repair=request.method == "POST")
+    return jsonify(report), 409 if "error" in report else 200
+
+def site_static(filename, url_path):
+    # Every site's STATIC_URL_PATH gets a route; each site only answers on its own.
+    if cfg.STATIC_URL_PATH != url_path:
+        abort(404)
+    return send_from_directory(cfg.STATIC_FOLDER, filename)
+
+if default_site:
+    app.register_blueprint(gallery)
+else:
+    # Flask's static route only knows one folder, so each site serves its own assets.
+    for i, url_path in enumerate(sorted({site.config.STATIC_URL_PATH for site in sites.values()})):
+        gallery.add_url_rule(f"{url_path}/<path:filename>", endpoint=f"site_static_{i}",
+                             view_func=site_static, defaults={"url_path": url_path})
+    app.register_blueprint(gallery, url_prefix="/<site>")
+
+    @app.route("/")
+    def site_list():
+        links = "".join(f'<li><a href="/{name}/">{name}</a></li>' for name in sites)
+        return f"<!DOCTYPE html><html><head><title>NeoGallery</title></head><body><h1>NeoGallery sites</h1><ul>{links}</ul></body></html>"
+
 # ----------------------- ENTRY POINT -----------------------
 if __name__ == "__main__":
-    if not cfg.API_KEY and not (cfg.USER and cfg.PASS):
+    if len(sys.argv) > 1 and sys.argv[1] == "fsck":
+        # python NeoGallery.py fsck [--repair|--fix] [site ...]
+        # Only reports unless --repair (or --fix) is given.
+        names = [arg for arg in sys.argv[2:] if not arg.startswith("--")]
+        unknown = [name for name in names if name not in sites]
+        if unknown:
+            print(f"[ERROR] Unknown site(s): {', '.join(unknown)}")
+        targets = [default_site] if default_site else [sites[name] for name in names or sites if name in sites]
+        for site in targets:
+            with app.app_context():
+                g.site = site
+                report = run_fsck(repair=bool({"--repair", "--fix"} & set(sys.argv[2:])))
+            if site.name:
+                print(f"Site: {site.name}")
+            print(json.dumps(report, indent=2))
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-catalog":
+        # python NeoGallery.py bench-catalog [entries]
+        benchmark_catalog(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench-codec":
+        # python NeoGallery.py bench-codec [entries]
+        benchmark_codecs(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    elif not any(site.has_credentials for site in ([default_site] if default_site else sites.values())):
         print("You will not be able to use this program! Please add your API key to the .env under NEOCITIES_API_KEY, and relaunch.")
         input("Press any key to exit program...")
     else:
-        if cfg.DEBUG:
-            print(f"Hosted at: {cfg.HOST}:{cfg.PORT}")
-            app.run(host=cfg.HOST, port=cfg.PORT, debug=True)
+        for site in sites.values():
+            if not site.has_credentials:
+                print(f"[ERROR] Site '{site.name}' has no Neocities API key; its uploads will be skipped")
+        if server_cfg.DEBUG:
+            print(f"Hosted at: {server_cfg.HOST}:{server_cfg.PORT}")
+            app.run(host=server_cfg.HOST, port=server_cfg.PORT, debug=True)
         else:
             print("""Welcome to...
  ______              ______       _ _                            __  __ 
@@ -783,6 +1924,6 @@ if __name__ == "__main__":
 | |   | ( (/ / |_| | \____/( ( | | | ( (/ /| |   | |_| |   \ V / | |_| |
 |_|   |_|\____)___/ \_____/ \_||_|_|_|\____)_|    \__  |    \_/  |_(_)_|
                                                  (____/Author: KingPoss""")
-            print(f"Hosted at: {cfg.HOST}:{cfg.PORT}")
-            webbrowser.open(f"http://{cfg.HOST}:{cfg.PORT}", new=1)
-            serve(app, host=cfg.HOST, port=cfg.PORT, threads=100)
+            print(f"Hosted at: {server_cfg.HOST}:{server_cfg.PORT}")
+            webbrowser.open(f"http://{server_cfg.HOST}:{server_cfg.PORT}", new=1)
+            serve(app, host=server_cfg.HOST, port=server_cfg.PORT, threads=100)